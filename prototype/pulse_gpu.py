@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Optional CUDA batch-verification backend for the Pulse prototype.
+
+Wraps the ufsecp256k1 GPU batch-verify C ABI via ctypes. The shared
+library is only present on high-throughput node deployments with a
+CUDA-capable card; load_backend() returns None everywhere else and the
+node falls back to its CPU thread-pool path.
+"""
+
+import ctypes
+import ctypes.util
+
+import numpy as np
+
+# int ufsecp_gpu_verify_batch(const uint8_t *pubkeys65,
+#                             const uint8_t *digests32,
+#                             const uint8_t *sigs64,
+#                             uint8_t *out, size_t n);
+_LIB_NAME = "ufsecp256k1"
+
+
+def der_to_compact(der: bytes) -> bytes:
+    """Convert a DER ECDSA signature to 64-byte r||s compact form."""
+    if len(der) < 8 or der[0] != 0x30:
+        raise ValueError("not a DER signature")
+    i = 2  # Skip SEQUENCE header (short-form length; sigs are < 128 bytes)
+    out = b""
+    for _ in range(2):
+        if i + 2 > len(der) or der[i] != 0x02:
+            raise ValueError("malformed DER integer")
+        length = der[i + 1]
+        val = der[i + 2:i + 2 + length].lstrip(b"\x00")
+        if len(val) > 32:
+            raise ValueError("integer too large for secp256k1")
+        out += val.rjust(32, b"\x00")
+        i += 2 + length
+    return out
+
+
+class GpuVerifier:
+    """ctypes wrapper around the batch-verify entry point."""
+
+    def __init__(self, lib: ctypes.CDLL):
+        self._fn = lib.ufsecp_gpu_verify_batch
+        self._fn.restype = ctypes.c_int
+        self._fn.argtypes = [ctypes.c_void_p] * 4 + [ctypes.c_size_t]
+
+    def verify_batch(self, pubkeys: np.ndarray, digests: np.ndarray,
+                     sigs: np.ndarray) -> np.ndarray:
+        """Verify n signatures in one GPU call; returns a bool mask."""
+        n = len(pubkeys)
+        out = np.zeros(n, dtype=np.uint8)
+        rc = self._fn(pubkeys.ctypes.data, digests.ctypes.data,
+                      sigs.ctypes.data, out.ctypes.data, n)
+        if rc != 0:
+            raise RuntimeError(f"GPU batch verify failed (rc={rc})")
+        return out.astype(bool)
+
+
+def load_backend():
+    """Return a GpuVerifier if the CUDA library is present, else None."""
+    path = ctypes.util.find_library(_LIB_NAME)
+    if path is None:
+        return None
+    try:
+        return GpuVerifier(ctypes.CDLL(path))
+    except (OSError, AttributeError):
+        return None
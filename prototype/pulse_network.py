@@ -6,55 +6,249 @@ A working prototype of Proof-of-Life consensus.
 Run: python pulse_network.py
 """
 
+import functools
 import hashlib
-import json
+import os
+import struct
 import time
-import random
-from dataclasses import dataclass, field, asdict
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from typing import List, Dict, Optional
-from ecdsa import SigningKey, VerifyingKey, SECP256k1, BadSignatureError
+from coincurve import PrivateKey, PublicKey
 import math
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional; the NumPy path is used without it
+    njit = None
+
+try:
+    import pulse_gpu
+except ImportError:  # GPU backend only ships on CUDA node deployments
+    pulse_gpu = None
 
 
 # =============================================================================
 # CRYPTO LAYER
 # =============================================================================
 
+def _pack_heartbeat(timestamp: float, timestamp_ns: int, heart_rate: int,
+                    mx: float, my: float, mz: float,
+                    temperature: float, device_pubkey: str) -> bytes:
+    """Deterministic byte layout of the signable heartbeat fields."""
+    return struct.pack("<dqIdddd", timestamp, timestamp_ns, heart_rate,
+                       mx, my, mz, temperature) + bytes.fromhex(device_pubkey)
+
+
+def _pack_str(s: str) -> bytes:
+    """Length-prefixed string encoding for variable-width fields."""
+    raw = s.encode()
+    return struct.pack("<I", len(raw)) + raw
+
+
+def _pack_transaction(tx_id: str, sender_pubkey: str, recipient_pubkey: str,
+                      amount: float, timestamp: float,
+                      heartbeat_signature: str) -> bytes:
+    """Deterministic byte layout of the signable transaction fields."""
+    return (struct.pack("<dd", amount, timestamp) +
+            _pack_str(tx_id) +
+            bytes.fromhex(sender_pubkey) +
+            bytes.fromhex(recipient_pubkey) +
+            _pack_str(heartbeat_signature))
+
+
+def _merkle_root(leaves: List[bytes]) -> bytes:
+    """Merkle root of pre-hashed leaves via iterative pairwise SHA-256.
+
+    hashlib.sha256 dispatches to OpenSSL, which picks up the SHA-NI
+    instructions where the CPU has them. The loop reuses one 64-byte
+    scratch buffer so the only per-node allocation is the digest itself.
+    """
+    if not leaves:
+        return hashlib.sha256(b"").digest()
+    level = list(leaves)
+    buf = bytearray(64)
+    sha256 = hashlib.sha256
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])  # Duplicate last leaf on odd levels
+        parents = []
+        for i in range(0, len(level), 2):
+            buf[:32] = level[i]
+            buf[32:] = level[i + 1]
+            parents.append(sha256(buf).digest())
+        level = parents
+    return level[0]
+
+
+def _merkle_proofs(leaves: List[bytes]):
+    """Merkle root plus per-leaf sibling paths (same tree as _merkle_root)."""
+    if not leaves:
+        return hashlib.sha256(b"").digest(), []
+    proofs: List[List[bytes]] = [[] for _ in leaves]
+    level = list(leaves)
+    members = [[i] for i in range(len(leaves))]  # Leaf indices under each node
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])  # Duplicate last leaf on odd levels
+            members.append([])
+        parents = []
+        parent_members = []
+        for i in range(0, len(level), 2):
+            left, right = level[i], level[i + 1]
+            for leaf_i in members[i]:
+                proofs[leaf_i].append(right)
+            for leaf_i in members[i + 1]:
+                proofs[leaf_i].append(left)
+            parents.append(hashlib.sha256(left + right).digest())
+            parent_members.append(members[i] + members[i + 1])
+        level, members = parents, parent_members
+    return level[0], proofs
+
+
+def _merkle_proof_root(leaf: bytes, proof: List[bytes], index: int) -> bytes:
+    """Recompute a Merkle root from a leaf, its sibling path and position."""
+    node = leaf
+    for sibling in proof:
+        if index % 2:
+            node = hashlib.sha256(sibling + node).digest()
+        else:
+            node = hashlib.sha256(node + sibling).digest()
+        index //= 2
+    return node
+
+
+class _MerkleAccumulator:
+    """Incremental Merkle accumulator (binary counter of subtree roots).
+
+    Keeps one partial root per power-of-two subtree, so add() is
+    amortized O(1) hashing and root() folds the O(log N) pending peaks
+    without ever touching the leaves again.
+    """
+
+    def __init__(self):
+        self._peaks: List[Optional[bytes]] = []  # Slot i holds a 2^i subtree root
+        self.count = 0
+
+    def add(self, digest: bytes):
+        carry = digest
+        i = 0
+        while True:
+            if i == len(self._peaks):
+                self._peaks.append(carry)
+                break
+            if self._peaks[i] is None:
+                self._peaks[i] = carry
+                break
+            carry = hashlib.sha256(self._peaks[i] + carry).digest()
+            self._peaks[i] = None
+            i += 1
+        self.count += 1
+
+    def root(self) -> bytes:
+        if self.count == 0:
+            return hashlib.sha256(b"").digest()
+        node = None
+        for peak in self._peaks:  # Fold low-to-high into the larger subtrees
+            if peak is None:
+                continue
+            node = peak if node is None else hashlib.sha256(peak + node).digest()
+        return node
+
+
 def generate_keypair():
-    """Generate ECDSA keypair for device/user identity."""
-    sk = SigningKey.generate(curve=SECP256k1)
-    vk = sk.get_verifying_key()
-    return sk.to_string().hex(), vk.to_string().hex()
+    """Generate ECDSA keypair (secp256k1 via libsecp256k1) for device/user identity."""
+    sk = PrivateKey()
+    return sk.secret.hex(), sk.public_key.format(compressed=False).hex()
 
 
-def sign_data(private_key_hex: str, data: dict) -> str:
-    """Sign data with private key."""
-    sk = SigningKey.from_string(bytes.fromhex(private_key_hex), curve=SECP256k1)
-    message = json.dumps(data, sort_keys=True).encode()
-    signature = sk.sign(message)
-    return signature.hex()
+def sign_digest(private_key_hex: str, digest: bytes) -> str:
+    """Sign a precomputed 32-byte digest with private key."""
+    sk = PrivateKey(bytes.fromhex(private_key_hex))
+    return sk.sign(digest, hasher=None).hex()
 
 
-def verify_signature(public_key_hex: str, data: dict, signature_hex: str) -> bool:
-    """Verify signature against public key."""
+def sign_data(private_key_hex: str, payload: bytes) -> str:
+    """Sign a packed payload with private key."""
+    return sign_digest(private_key_hex, hashlib.sha256(payload).digest())
+
+
+# Parsed public keys, keyed by raw key bytes. Point decoding costs a
+# decompression plus a validity check, so pay it once per distinct device.
+_VK_CACHE_MAX = 4096
+_vk_cache: "OrderedDict[bytes, PublicKey]" = OrderedDict()
+
+
+def _public_key(pubkey_bytes: bytes) -> PublicKey:
+    """Parse a public key, LRU-cached with a bounded size."""
+    vk = _vk_cache.get(pubkey_bytes)
+    if vk is None:
+        vk = PublicKey(pubkey_bytes)
+        _vk_cache[pubkey_bytes] = vk
+        if len(_vk_cache) > _VK_CACHE_MAX:
+            _vk_cache.popitem(last=False)
+    else:
+        _vk_cache.move_to_end(pubkey_bytes)
+    return vk
+
+
+@functools.lru_cache(maxsize=65536)
+def _verify_cached(pubkey_bytes: bytes, digest: bytes, sig_bytes: bytes) -> bool:
+    """Raw digest verification, memoized so pool churn never re-verifies."""
+    try:
+        return _public_key(pubkey_bytes).verify(sig_bytes, digest, hasher=None)
+    except ValueError:
+        return False
+
+
+def verify_digest(public_key_hex: str, digest: bytes, signature_hex: str) -> bool:
+    """Verify a signature over a precomputed 32-byte digest."""
     try:
-        vk = VerifyingKey.from_string(bytes.fromhex(public_key_hex), curve=SECP256k1)
-        message = json.dumps(data, sort_keys=True).encode()
-        return vk.verify(bytes.fromhex(signature_hex), message)
-    except BadSignatureError:
+        return _verify_cached(bytes.fromhex(public_key_hex), digest,
+                              bytes.fromhex(signature_hex))
+    except ValueError:
         return False
 
 
-def hash_block(block: dict) -> str:
-    """SHA-256 hash of block contents."""
-    return hashlib.sha256(json.dumps(block, sort_keys=True).encode()).hexdigest()
+def verify_signature(public_key_hex: str, payload: bytes, signature_hex: str) -> bool:
+    """Verify signature against public key."""
+    return verify_digest(public_key_hex, hashlib.sha256(payload).digest(),
+                         signature_hex)
+
+
+def hash_block(header: bytes) -> str:
+    """SHA-256 hash of a packed block header."""
+    return hashlib.sha256(header).hexdigest()
+
+
+# =============================================================================
+# CONSENSUS MATH
+# =============================================================================
+
+# Fork probability P = exp(-k·S) with k tuned for small-scale testing.
+# The table precomputes S in steps of 0.01 so the per-block path is an
+# index lookup instead of a transcendental call.
+_FORK_K = 0.5
+_EXP_TABLE = np.exp(-_FORK_K * np.arange(0, 1000, 0.01))
+
+
+def fork_probability(security: float, k: float = _FORK_K) -> float:
+    """P(fork) = exp(-k·S), via table lookup on the standard k."""
+    if k == _FORK_K and 0 <= security < 1000:
+        return float(_EXP_TABLE[int(security * 100)])
+    x = k * security
+    if x < 1e-3:
+        return 1.0 - x + 0.5 * x * x  # 2-term Taylor, avoids exp entirely
+    return math.exp(-x)
 
 
 # =============================================================================
 # DATA STRUCTURES
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class Heartbeat:
     """A single heartbeat packet from a device."""
     timestamp: float
@@ -62,19 +256,55 @@ class Heartbeat:
     motion: Dict[str, float] # {x, y, z}
     temperature: float
     device_pubkey: str
+    timestamp_ns: int = 0    # Wall-clock ns at capture; signed over
     signature: str = ""
-    
-    def to_signable(self) -> dict:
-        """Data that gets signed (excludes signature itself)."""
+    # Batch signing: the signature covers batch_root rather than this
+    # heartbeat alone, and batch_proof/batch_index prove inclusion
+    batch_root: str = ""
+    batch_proof: List[str] = field(default_factory=list)
+    batch_index: int = 0
+    # Node-side caches, populated at verify/assembly time
+    _digest: Optional[bytes] = field(default=None, repr=False, compare=False)
+    _cached_weight: Optional[float] = field(default=None, repr=False, compare=False)
+    _signed_digest: Optional[bytes] = field(default=None, repr=False, compare=False)
+
+    def signed_digest(self) -> bytes:
+        """SHA-256 of to_signed_bytes(), computed once per instance."""
+        if self._signed_digest is None:
+            self._signed_digest = hashlib.sha256(self.to_signed_bytes()).digest()
+        return self._signed_digest
+
+    def to_dict(self) -> dict:
+        """Explicit dict form; skips dataclasses.asdict's reflection loop."""
         return {
             "timestamp": self.timestamp,
             "heart_rate": self.heart_rate,
-            "motion": self.motion,
+            "motion": dict(self.motion),
             "temperature": self.temperature,
-            "device_pubkey": self.device_pubkey
+            "device_pubkey": self.device_pubkey,
+            "timestamp_ns": self.timestamp_ns,
+            "signature": self.signature,
+            "batch_root": self.batch_root,
+            "batch_proof": list(self.batch_proof),
+            "batch_index": self.batch_index,
         }
+
+    def to_signed_bytes(self) -> bytes:
+        """Packed bytes that get signed (excludes signature itself)."""
+        return _pack_heartbeat(self.timestamp, self.timestamp_ns,
+                               self.heart_rate,
+                               self.motion["x"], self.motion["y"],
+                               self.motion["z"], self.temperature,
+                               self.device_pubkey)
     
-    def weight(self, alpha=0.4, beta=0.4, gamma=0.2) -> float:
+    @property
+    def weight(self) -> float:
+        """Memoized W_i; safe because heartbeat data is immutable post-sign."""
+        if self._cached_weight is None:
+            self._cached_weight = self._compute_weight()
+        return self._cached_weight
+
+    def _compute_weight(self, alpha=0.4, beta=0.4, gamma=0.2) -> float:
         """
         Calculate weighted contribution W_i = α·HR + β·||M|| + γ·continuity
         Normalized to ~1.0 for average human.
@@ -91,7 +321,50 @@ class Heartbeat:
         return alpha * hr_norm + beta * motion_norm + gamma * continuity
 
 
-@dataclass
+def verify_heartbeat_signature(hb: Heartbeat) -> bool:
+    """Verify a heartbeat's signature, batch-signed or individual.
+
+    For batch-signed heartbeats the ECDSA verify runs against the Merkle
+    root, which the signature cache collapses to one verify per batch;
+    each member then only costs its inclusion-proof hashes.
+    """
+    if hb.batch_root:
+        root = _merkle_proof_root(hb.signed_digest(),
+                                  [bytes.fromhex(p) for p in hb.batch_proof],
+                                  hb.batch_index)
+        if root.hex() != hb.batch_root:
+            return False
+        return verify_signature(hb.device_pubkey, root, hb.signature)
+    return verify_digest(hb.device_pubkey, hb.signed_digest(), hb.signature)
+
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True)
+    def _weights_kernel(hr, mx, my, mz, alpha, beta, gamma):
+        n = hr.shape[0]
+        out = np.empty(n)
+        for i in prange(n):
+            motion_norm = math.sqrt(mx[i] * mx[i] + my[i] * my[i] +
+                                    mz[i] * mz[i]) / 0.5
+            if motion_norm > 2.0:
+                motion_norm = 2.0
+            out[i] = alpha * (hr[i] / 70.0) + beta * motion_norm + gamma
+        return out
+else:
+    _weights_kernel = None
+
+
+def compute_weights(hr: np.ndarray, mx: np.ndarray, my: np.ndarray,
+                    mz: np.ndarray, alpha=0.4, beta=0.4, gamma=0.2) -> np.ndarray:
+    """Vectorized Heartbeat.weight() over SoA arrays of pool numerics."""
+    if _weights_kernel is not None:
+        return _weights_kernel(hr, mx, my, mz, alpha, beta, gamma)
+    hr_norm = hr / 70.0
+    motion_norm = np.minimum(np.sqrt(mx * mx + my * my + mz * mz) / 0.5, 2.0)
+    return alpha * hr_norm + beta * motion_norm + gamma  # continuity = 1.0
+
+
+@dataclass(slots=True)
 class Transaction:
     """A pulse-backed transaction."""
     tx_id: str
@@ -101,44 +374,68 @@ class Transaction:
     timestamp: float
     heartbeat_signature: str  # Must reference a valid, recent heartbeat
     signature: str = ""
+    # Node-side caches, populated at verify time
+    _digest: Optional[bytes] = field(default=None, repr=False, compare=False)
+    _signed_digest: Optional[bytes] = field(default=None, repr=False, compare=False)
+
+    def signed_digest(self) -> bytes:
+        """SHA-256 of to_signed_bytes(), computed once per instance."""
+        if self._signed_digest is None:
+            self._signed_digest = hashlib.sha256(self.to_signed_bytes()).digest()
+        return self._signed_digest
     
-    def to_signable(self) -> dict:
+    def to_dict(self) -> dict:
+        """Explicit dict form; skips dataclasses.asdict's reflection loop."""
         return {
             "tx_id": self.tx_id,
             "sender_pubkey": self.sender_pubkey,
             "recipient_pubkey": self.recipient_pubkey,
             "amount": self.amount,
             "timestamp": self.timestamp,
-            "heartbeat_signature": self.heartbeat_signature
+            "heartbeat_signature": self.heartbeat_signature,
+            "signature": self.signature,
         }
 
+    def to_signed_bytes(self) -> bytes:
+        return _pack_transaction(self.tx_id, self.sender_pubkey,
+                                 self.recipient_pubkey, self.amount,
+                                 self.timestamp, self.heartbeat_signature)
+
 
-@dataclass
+@dataclass(slots=True)
 class PulseBlock:
     """A block in the Pulse chain."""
     index: int
     timestamp: float
     previous_hash: str
-    heartbeats: List[dict]
-    transactions: List[dict]
+    heartbeats: List[Heartbeat]
+    transactions: List[Transaction]
+    merkle_root: str = ""     # Root of heartbeat + transaction digests
     block_hash: str = ""
-    
+
     # Metrics
     n_live: int = 0           # Number of verified heartbeats
     total_weight: float = 0.0 # Sum of W_i
     security: float = 0.0     # S = Σ W_i
-    
+
+    @property
+    def heartbeats_as_dicts(self) -> List[dict]:
+        """Heartbeat payload in dict form, for serialization only."""
+        return [hb.to_dict() for hb in self.heartbeats]
+
+    @property
+    def transactions_as_dicts(self) -> List[dict]:
+        """Transaction payload in dict form, for serialization only."""
+        return [tx.to_dict() for tx in self.transactions]
+
     def compute_hash(self) -> str:
-        data = {
-            "index": self.index,
-            "timestamp": self.timestamp,
-            "previous_hash": self.previous_hash,
-            "heartbeats": self.heartbeats,
-            "transactions": self.transactions,
-            "n_live": self.n_live,
-            "total_weight": self.total_weight
-        }
-        return hash_block(data)
+        # Heartbeats/transactions enter the hash only through merkle_root,
+        # so the header is a fixed 92 bytes regardless of pool size.
+        header = struct.pack("<qd32s32sId", self.index, self.timestamp,
+                             bytes.fromhex(self.previous_hash),
+                             bytes.fromhex(self.merkle_root),
+                             self.n_live, self.total_weight)
+        return hash_block(header)
 
 
 # =============================================================================
@@ -148,41 +445,95 @@ class PulseBlock:
 class Device:
     """Simulates a wearable device capturing heartbeats."""
     
-    def __init__(self, name: str = "device"):
+    def __init__(self, name: str = "device", batch_size: int = 16):
         self.name = name
         self.private_key, self.public_key = generate_keypair()
         self.last_heartbeat_time = 0
-        
-    def capture_heartbeat(self, 
-                          hr_base: int = 70, 
-                          activity_level: float = 0.0) -> Heartbeat:
+        self.batch_size = batch_size
+        self._pending: List[Heartbeat] = []  # Captured but not yet signed
+        self._rng = np.random.default_rng()  # PCG64; far faster than random
+
+    def batch_capture(self, n: int,
+                      hr_base: int = 70,
+                      activity_level: float = 0.0) -> List[Heartbeat]:
         """
-        Capture a simulated heartbeat.
+        Build n unsigned simulated heartbeats with vectorized RNG draws.
         activity_level: 0.0 (resting) to 1.0 (intense exercise)
         """
-        # Simulate realistic biometrics
-        hr = hr_base + int(activity_level * 60) + random.randint(-5, 5)
-        motion = {
-            "x": random.gauss(0, 0.1) + activity_level * 0.5,
-            "y": random.gauss(0, 0.1) + activity_level * 0.3,
-            "z": random.gauss(0, 0.05) + activity_level * 0.2
-        }
-        temp = 36.5 + random.gauss(0, 0.3) + activity_level * 0.5
-        
-        hb = Heartbeat(
-            timestamp=time.time(),
-            heart_rate=hr,
-            motion=motion,
-            temperature=round(temp, 1),
-            device_pubkey=self.public_key
-        )
-        
-        # Sign the heartbeat
-        hb.signature = sign_data(self.private_key, hb.to_signable())
-        self.last_heartbeat_time = hb.timestamp
-        
+        # Simulate realistic biometrics, all samples drawn in one pass
+        rng = self._rng
+        hr = hr_base + int(activity_level * 60) + rng.integers(-5, 6, n)
+        gx = rng.normal(0, 0.1, n) + activity_level * 0.5
+        gy = rng.normal(0, 0.1, n) + activity_level * 0.3
+        gz = rng.normal(0, 0.05, n) + activity_level * 0.2
+        temp = 36.5 + rng.normal(0, 0.3, n) + activity_level * 0.5
+
+        now_ns = time.time_ns()
+        heartbeats = [
+            Heartbeat(
+                timestamp=now_ns / 1e9,  # Float form kept for display
+                heart_rate=int(hr[i]),
+                motion={"x": float(gx[i]), "y": float(gy[i]), "z": float(gz[i])},
+                temperature=round(float(temp[i]), 1),
+                device_pubkey=self.public_key,
+                timestamp_ns=now_ns
+            )
+            for i in range(n)
+        ]
+        self.last_heartbeat_time = now_ns / 1e9
+        return heartbeats
+
+    def _simulate_heartbeat(self,
+                            hr_base: int = 70,
+                            activity_level: float = 0.0) -> Heartbeat:
+        """Build a single unsigned simulated heartbeat."""
+        return self.batch_capture(1, hr_base, activity_level)[0]
+
+    def capture_heartbeat(self,
+                          hr_base: int = 70,
+                          activity_level: float = 0.0) -> Heartbeat:
+        """Capture and individually sign a simulated heartbeat."""
+        hb = self._simulate_heartbeat(hr_base, activity_level)
+        hb.signature = sign_data(self.private_key, hb.to_signed_bytes())
         return hb
 
+    def queue_heartbeat(self,
+                        hr_base: int = 70,
+                        activity_level: float = 0.0) -> List[Heartbeat]:
+        """Capture a heartbeat into the pending batch.
+
+        Returns the signed batch when this pulse fills it to batch_size
+        (auto-flush), otherwise an empty list; call flush_batch() to
+        sign a partial batch.
+        """
+        self._pending.append(self._simulate_heartbeat(hr_base, activity_level))
+        if len(self._pending) >= self.batch_size:
+            return self.flush_batch()
+        return []
+
+    def flush_batch(self) -> List[Heartbeat]:
+        """Sign all pending heartbeats with one ECDSA op.
+
+        Builds a Merkle tree over the pending pulses and signs only the
+        root, so the amortized per-pulse signing cost is a few hash ops.
+        Each heartbeat carries the root signature plus its inclusion
+        proof.
+        """
+        if not self._pending:
+            return []
+        batch, self._pending = self._pending, []
+        # Hash locally rather than via signed_digest(): that cache is
+        # the verifier's to populate from the bytes it checks
+        leaves = [hashlib.sha256(hb.to_signed_bytes()).digest() for hb in batch]
+        root, proofs = _merkle_proofs(leaves)
+        root_sig = sign_data(self.private_key, root)
+        for i, (hb, proof) in enumerate(zip(batch, proofs)):
+            hb.signature = root_sig
+            hb.batch_root = root.hex()
+            hb.batch_index = i
+            hb.batch_proof = [p.hex() for p in proof]
+        return batch
+
 
 # =============================================================================
 # NODE
@@ -203,7 +554,16 @@ class PulseNode:
         
         # State
         self.chain: List[PulseBlock] = []
-        self.heartbeat_pool: List[Heartbeat] = []
+        # pubkey -> latest heartbeat; dict gives O(1) dedup and liveness
+        self.heartbeat_pool: Dict[str, Heartbeat] = {}
+        self._staging: List[Heartbeat] = []  # Awaiting batch signature verify
+        self._gpu = pulse_gpu.load_backend() if pulse_gpu else None
+        # Running Merkle accumulators so assemble_block finalizes the
+        # block root in O(log N) instead of reducing every leaf
+        self._hb_merkle = _MerkleAccumulator()
+        self._tx_merkle = _MerkleAccumulator()
+        self._hb_merkle_dirty = False
+        self._verify_executor = ThreadPoolExecutor(max_workers=os.cpu_count())
         self.tx_pool: List[Transaction] = []
         self.balances: Dict[str, float] = {}  # pubkey -> balance
         
@@ -211,6 +571,9 @@ class PulseNode:
         self.total_minted = 0.0
         self.blocks_created = 0
         
+        # Pay the one-time JIT compile cost up front, not on the first block
+        compute_weights(*(np.zeros(1),) * 4)
+
         # Create genesis block
         self._create_genesis()
     
@@ -222,6 +585,7 @@ class PulseNode:
             previous_hash="0" * 64,
             heartbeats=[],
             transactions=[],
+            merkle_root=_merkle_root([]).hex(),
             n_live=0,
             total_weight=0.0,
             security=0.0
@@ -230,72 +594,190 @@ class PulseNode:
         self.chain.append(genesis)
         print(f"🌱 Genesis block created: {genesis.block_hash[:16]}...")
     
-    def verify_heartbeat(self, hb: Heartbeat) -> bool:
-        """Verify a heartbeat packet."""
-        # 1. Check signature
-        if not verify_signature(hb.device_pubkey, hb.to_signable(), hb.signature):
-            print(f"❌ Invalid signature for heartbeat from {hb.device_pubkey[:8]}...")
-            return False
-        
-        # 2. Check timestamp freshness (within last 30 seconds)
-        if time.time() - hb.timestamp > 30:
+    def _check_heartbeat(self, hb: Heartbeat) -> bool:
+        """Cheap field checks (everything except the signature)."""
+        # 1. Check timestamp freshness (within last 30 seconds),
+        #    as pure integer math on nanosecond stamps
+        if time.time_ns() - hb.timestamp_ns > 30_000_000_000:
             print(f"❌ Stale heartbeat from {hb.device_pubkey[:8]}...")
             return False
-        
-        # 3. Basic sanity checks
+
+        # 2. Basic sanity checks
         if not (30 <= hb.heart_rate <= 220):
             print(f"❌ Invalid heart rate: {hb.heart_rate}")
             return False
-        
+
+        # Rederive the signable digest from the current field values —
+        # never trust a cache filled before the node saw the object —
+        # then cache the Merkle leaf digest once per verified heartbeat
+        packed = hb.to_signed_bytes()
+        hb._signed_digest = hashlib.sha256(packed).digest()
+        hb._digest = hashlib.sha256(packed +
+                                    bytes.fromhex(hb.signature)).digest()
         return True
-    
+
+    def verify_heartbeat(self, hb: Heartbeat) -> bool:
+        """Verify a heartbeat packet (field checks plus signature)."""
+        if not self._check_heartbeat(hb):
+            return False
+        if not verify_heartbeat_signature(hb):
+            print(f"❌ Invalid signature for heartbeat from {hb.device_pubkey[:8]}...")
+            return False
+        return True
+
     def receive_heartbeat(self, hb: Heartbeat) -> bool:
-        """Receive and validate a heartbeat."""
-        if self.verify_heartbeat(hb):
-            # Check for duplicate in current pool
-            for existing in self.heartbeat_pool:
-                if existing.device_pubkey == hb.device_pubkey:
-                    # Update with newer heartbeat
-                    self.heartbeat_pool.remove(existing)
-                    break
-            
-            self.heartbeat_pool.append(hb)
+        """Stage a heartbeat for the pool after cheap field checks.
+
+        Signature verification is deferred to flush_pool() so a whole
+        batch can be verified in parallel.
+        """
+        if self._check_heartbeat(hb):
+            self._staging.append(hb)
             return True
         return False
+
+    def flush_pool(self):
+        """Batch-verify staged heartbeats and admit the valid ones.
+
+        libsecp256k1 releases the GIL during verification, so a thread
+        pool scales across cores. A failed verify rejects only that
+        heartbeat; the rest of the batch proceeds.
+        """
+        if not self._staging:
+            return
+        staged, self._staging = self._staging, []
+        if len(staged) >= 8:
+            # Same-validator amortization: heartbeats batch-signed by one
+            # device share a single (pubkey, root, signature) triple, so
+            # run the expensive ECDSA verify once per distinct triple and
+            # let the signature cache serve the remaining members, whose
+            # own check is then just their inclusion-proof hashes.
+            unique: Dict[tuple, Heartbeat] = {}
+            for hb in staged:
+                unique.setdefault(
+                    (hb.device_pubkey, hb.batch_root, hb.signature), hb)
+            reps = dict(zip(unique.keys(), self._verify_executor.map(
+                verify_heartbeat_signature, unique.values())))
+            results = [
+                reps[key] if unique[key] is hb else verify_heartbeat_signature(hb)
+                for hb, key in ((hb, (hb.device_pubkey, hb.batch_root,
+                                      hb.signature)) for hb in staged)]
+        else:
+            results = self._verify_executor.map(verify_heartbeat_signature,
+                                                staged)
+        for hb, ok in zip(staged, results):
+            if not ok:
+                print(f"❌ Invalid signature for heartbeat from {hb.device_pubkey[:8]}...")
+                continue
+            self._admit_heartbeat(hb)
+
+    def _admit_heartbeat(self, hb: Heartbeat):
+        """Admit a fully verified heartbeat into the pool."""
+        # Dict assignment replaces any duplicate (latest wins)
+        if hb.device_pubkey in self.heartbeat_pool:
+            self._hb_merkle_dirty = True  # Accumulator can't remove a leaf
+        elif not self._hb_merkle_dirty:
+            self._hb_merkle.add(hb._digest)
+
+        self.heartbeat_pool[hb.device_pubkey] = hb
+
+    def flush_pool_gpu(self):
+        """Batch-verify staged heartbeats on the GPU backend.
+
+        Collects the staging queue into contiguous uint8 arrays
+        (pubkey[65], digest[32], compact sig[64]) and hands them to the
+        CUDA library in a single call. Merkle inclusion proofs for
+        batch-signed heartbeats stay on the CPU since each is only a few
+        hashes. Falls back to the threaded CPU flush when no backend is
+        loaded.
+        """
+        if self._gpu is None or not self._staging:
+            return self.flush_pool()
+        staged, self._staging = self._staging, []
+        n = len(staged)
+        pubkeys = np.zeros((n, 65), np.uint8)
+        digests = np.zeros((n, 32), np.uint8)
+        sigs = np.zeros((n, 64), np.uint8)
+        ok = [True] * n
+        for i, hb in enumerate(staged):
+            if hb.batch_root:
+                root = _merkle_proof_root(
+                    hb.signed_digest(),
+                    [bytes.fromhex(p) for p in hb.batch_proof],
+                    hb.batch_index)
+                ok[i] = root.hex() == hb.batch_root
+                digest = hashlib.sha256(root).digest()
+            else:
+                digest = hb.signed_digest()
+            pubkeys[i] = np.frombuffer(bytes.fromhex(hb.device_pubkey), np.uint8)
+            digests[i] = np.frombuffer(digest, np.uint8)
+            try:
+                sigs[i] = np.frombuffer(
+                    pulse_gpu.der_to_compact(bytes.fromhex(hb.signature)),
+                    np.uint8)
+            except ValueError:
+                ok[i] = False
+        mask = self._gpu.verify_batch(pubkeys, digests, sigs)
+        for hb, proof_ok, sig_ok in zip(staged, ok, mask):
+            if not (proof_ok and sig_ok):
+                print(f"❌ Invalid signature for heartbeat from {hb.device_pubkey[:8]}...")
+                continue
+            self._admit_heartbeat(hb)
     
     def verify_transaction(self, tx: Transaction) -> bool:
         """Verify a transaction."""
-        # 1. Check signature
-        if not verify_signature(tx.sender_pubkey, tx.to_signable(), tx.signature):
+        # 1. Check signature, rederiving the signable digest from the
+        #    current field values — never trust a cache filled before
+        #    the node saw the object
+        packed = tx.to_signed_bytes()
+        tx._signed_digest = hashlib.sha256(packed).digest()
+        if not verify_digest(tx.sender_pubkey, tx._signed_digest, tx.signature):
             return False
-        
+
         # 2. Check sender has balance
         sender_balance = self.balances.get(tx.sender_pubkey, 0)
         if sender_balance < tx.amount:
             return False
-        
-        # 3. Check heartbeat signature exists in pool (sender is alive)
-        alive = False
-        for hb in self.heartbeat_pool:
-            if hb.device_pubkey == tx.sender_pubkey:
-                alive = True
-                break
-        
-        if not alive:
+
+        # 3. Check sender has a heartbeat in the pool (sender is alive)
+        if tx.sender_pubkey not in self.heartbeat_pool:
             print(f"❌ Transaction rejected: sender not pulsing")
             return False
-        
+
+        # Cache the Merkle leaf digest once per verified transaction
+        tx._digest = hashlib.sha256(packed +
+                                    bytes.fromhex(tx.signature)).digest()
         return True
     
     def receive_transaction(self, tx: Transaction) -> bool:
         """Receive and validate a transaction."""
         if self.verify_transaction(tx):
             self.tx_pool.append(tx)
+            self._tx_merkle.add(tx._digest)
             return True
         return False
     
+    def _pool_arrays(self):
+        """SoA (structure-of-arrays) view of the pool numerics."""
+        pool = self.heartbeat_pool.values()
+        n = len(self.heartbeat_pool)
+        hr = np.empty(n)
+        mx = np.empty(n)
+        my = np.empty(n)
+        mz = np.empty(n)
+        for i, hb in enumerate(pool):
+            hr[i] = hb.heart_rate
+            motion = hb.motion
+            mx[i] = motion["x"]
+            my[i] = motion["y"]
+            mz[i] = motion["z"]
+        return hr, mx, my, mz
+
     def assemble_block(self) -> Optional[PulseBlock]:
         """Assemble a new Pulse Block from the pool."""
+        # Admit anything still waiting on signature verification
+        self.flush_pool()
+
         # Check if we have enough live participants
         n_live = len(self.heartbeat_pool)
         
@@ -303,21 +785,36 @@ class PulseNode:
             print(f"⏳ Waiting for more heartbeats ({n_live}/{self.n_threshold})")
             return None
         
-        # Calculate total weight and security
-        total_weight = sum(hb.weight() for hb in self.heartbeat_pool)
+        # Calculate total weight and security in one vectorized pass,
+        # caching each weight so commit_block never recomputes it
+        weights = compute_weights(*self._pool_arrays())
+        for hb, w in zip(self.heartbeat_pool.values(), weights):
+            hb._cached_weight = float(w)
+        total_weight = float(weights.sum())
         security = total_weight  # S = Σ W_i
         
         # Calculate fork probability (for display)
-        k = 0.5  # Adjusted for small-scale testing
-        fork_prob = math.exp(-k * security)
+        fork_prob = fork_probability(security)
         
+        # Finalize the running accumulators in O(log N). Heartbeat
+        # replacement invalidates the accumulator (leaves can't be
+        # removed), in which case it is rebuilt from the cached digests.
+        if self._hb_merkle_dirty:
+            self._hb_merkle = _MerkleAccumulator()
+            for hb in self.heartbeat_pool.values():
+                self._hb_merkle.add(hb._digest)
+            self._hb_merkle_dirty = False
+        root = hashlib.sha256(self._hb_merkle.root() +
+                              self._tx_merkle.root()).digest()
+
         # Create block
         block = PulseBlock(
             index=len(self.chain),
             timestamp=time.time(),
             previous_hash=self.chain[-1].block_hash,
-            heartbeats=[asdict(hb) for hb in self.heartbeat_pool],
-            transactions=[asdict(tx) for tx in self.tx_pool],
+            heartbeats=list(self.heartbeat_pool.values()),
+            transactions=list(self.tx_pool),
+            merkle_root=root.hex(),
             n_live=n_live,
             total_weight=round(total_weight, 4),
             security=round(security, 4)
@@ -339,29 +836,30 @@ class PulseNode:
         self.chain.append(block)
         self.blocks_created += 1
         
-        # Distribute rewards based on weight
+        # Distribute rewards from the weights cached at assembly time
         if block.total_weight > 0:
-            for hb_dict in block.heartbeats:
-                hb = Heartbeat(**hb_dict)
-                reward = (hb.weight() / block.total_weight) * self.reward_per_block
-                
+            for hb in block.heartbeats:
+                reward = (hb.weight / block.total_weight) * self.reward_per_block
+
                 pubkey = hb.device_pubkey
                 self.balances[pubkey] = self.balances.get(pubkey, 0) + reward
                 self.total_minted += reward
-                
+
                 print(f"   💰 {pubkey[:8]}... earned {reward:.4f} PULSE")
-        
+
         # Process transactions
-        for tx_dict in block.transactions:
-            tx = Transaction(**tx_dict)
+        for tx in block.transactions:
             self.balances[tx.sender_pubkey] -= tx.amount
             self.balances[tx.recipient_pubkey] = \
                 self.balances.get(tx.recipient_pubkey, 0) + tx.amount
             print(f"   📤 TX: {tx.sender_pubkey[:8]}... → {tx.recipient_pubkey[:8]}... ({tx.amount} PULSE)")
         
         # Clear pools
-        self.heartbeat_pool = []
+        self.heartbeat_pool = {}
         self.tx_pool = []
+        self._hb_merkle = _MerkleAccumulator()
+        self._tx_merkle = _MerkleAccumulator()
+        self._hb_merkle_dirty = False
     
     def get_stats(self) -> dict:
         """Get network statistics."""
@@ -400,18 +898,19 @@ def run_simulation(n_users: int = 3, n_blocks: int = 5):
     
     # Simulate blocks
     print(f"\n📦 Simulating {n_blocks} blocks...\n")
-    
+
+    rng = np.random.default_rng()
     for block_num in range(n_blocks):
         print(f"\n--- Block interval {block_num + 1} ---")
-        
-        # Each device sends a heartbeat
+
+        # Each device sends a heartbeat, activity drawn per block
+        activities = rng.uniform(0, 0.5, n_users)
         for i, device in enumerate(devices):
-            # Vary activity levels
-            activity = random.uniform(0, 0.5) if i > 0 else 0.3
+            activity = float(activities[i]) if i > 0 else 0.3
             hb = device.capture_heartbeat(activity_level=activity)
             
             if node.receive_heartbeat(hb):
-                print(f"✅ {device.name} pulsed (HR: {hb.heart_rate}, W: {hb.weight():.3f})")
+                print(f"✅ {device.name} pulsed (HR: {hb.heart_rate}, W: {hb.weight:.3f})")
         
         # Try to create a block
         block = node.assemble_block()
@@ -430,9 +929,9 @@ def run_simulation(n_users: int = 3, n_blocks: int = 5):
                 recipient_pubkey=recipient.public_key,
                 amount=10.0,
                 timestamp=time.time(),
-                heartbeat_signature=node.chain[-1].heartbeats[0]["signature"]
+                heartbeat_signature=node.chain[-1].heartbeats[0].signature
             )
-            tx.signature = sign_data(sender.private_key, tx.to_signable())
+            tx.signature = sign_data(sender.private_key, tx.to_signed_bytes())
             
             if node.receive_transaction(tx):
                 print(f"\n📨 Transaction queued: {sender.name} → {recipient.name} (10 PULSE)")
@@ -457,7 +956,7 @@ def run_simulation(n_users: int = 3, n_blocks: int = 5):
     q = 0.1
     n_active = n_global * (1 - q)
     security = n_active  # W_avg = 1
-    fork_prob = math.exp(-0.000001 * security)
+    fork_prob = fork_probability(security, k=0.000001)
     tps = 0.1 * n_active / 5
     
     print(f"   At {n_global:,} users (10% offline):")